@@ -252,14 +252,14 @@ async def generate_all_functions_train_async(
     await asyncio.gather(*workers)
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="函数级训练样本生成器")
     parser.add_argument("project_path", help="项目路径")
     parser.add_argument("--output", "-o", help="输出目录路径")
     parser.add_argument("--ai-config", "-c", default="ai_config.json", help="AI配置文件路径")
     parser.add_argument("--function", "-f", help="指定生成特定函数的训练样本（格式：文件路径:函数名）")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # 计算项目名称和相关路径
     project_name = os.path.basename(os.path.abspath(args.project_path))
@@ -349,13 +349,13 @@ def should_ignore_path(file_path, ignore_dirs):
     return False
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="宏文档生成器")
     parser.add_argument("project_path", help="项目路径")
     parser.add_argument("--output", "-o", help="输出目录路径")
     parser.add_argument("--ai-config", "-c", default="ai_config.json", help="AI配置文件路径")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # 计算项目名称和相关路径
     project_name = os.path.basename(os.path.abspath(args.project_path))
@@ -6,8 +6,8 @@
 
 import os
 import argparse
-import json
 import asyncio
+import orjson
 
 # 导入日志模块
 from . import logger
@@ -67,8 +67,8 @@ def read_struct_info(project_name, output_dir):
         struct_info_path = os.path.join(output_dir, project_name, "struct_info.json")
     
     try:
-        with open(struct_info_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(struct_info_path, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         logger.error(f"错误: 找不到结构体信息文件 {struct_info_path}")
         return None
@@ -151,6 +151,7 @@ async def generate_all_structs_train_async(
     project_name,
     ai_config,
     ignore_dirs,
+    semaphore,
     max_concurrency=5
 ):
     struct_info = read_struct_info(project_name, output_dir)
@@ -158,7 +159,6 @@ async def generate_all_structs_train_async(
         return
 
     queue = asyncio.Queue(maxsize=max_concurrency * 2)
-    semaphore = asyncio.Semaphore(max_concurrency)
     num_workers = max_concurrency + 2
 
     # 启动固定数量 worker
@@ -208,14 +208,14 @@ def should_ignore_path(file_path, ignore_dirs):
     return False
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="结构体级训练样本生成器")
     parser.add_argument("project_path", help="项目路径")
     parser.add_argument("--output", "-o", help="输出目录路径")
     parser.add_argument("--ai-config", "-c", default="ai_config.json", help="AI配置文件路径")
     parser.add_argument("--struct", "-s", help="指定生成特定结构体的训练样本")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # 计算项目名称和相关路径
     project_name = os.path.basename(os.path.abspath(args.project_path))
@@ -226,36 +226,41 @@ def main():
     
     # 加载AI配置
     ai_config = load_ai_config(args.ai_config)
+    if not ai_config:
+        logger.error("AI 配置载入失败")
+        return
     
     # 获取忽略目录列表
-    ignore_dirs = get_ignore_dirs(ai_config) if ai_config else []
+    ignore_dirs = get_ignore_dirs(ai_config)
 
     max_concurrency = ai_config.get("max_concurrency", 5)
     
     # 生成结构体训练样本
-    try:
+    async def _run():
+        # 整个运行过程共用一个信号量，统一限制AI调用并发数
+        semaphore = asyncio.Semaphore(max_concurrency)
         if args.struct:
-            asyncio.run(
-                generate_single_struct_train_async(
-                    args.project_path,
-                    output_dir,
-                    project_name,
-                    args.struct,
-                    ai_config,
-                    asyncio.Semaphore(1)
-                )
+            await generate_single_struct_train_async(
+                args.project_path,
+                output_dir,
+                project_name,
+                args.struct,
+                ai_config,
+                semaphore
             )
         else:
-            asyncio.run(
-                generate_all_structs_train_async(
-                    args.project_path,
-                    output_dir,
-                    project_name,
-                    ai_config,
-                    ignore_dirs,
-                    max_concurrency=max_concurrency
-                )
+            await generate_all_structs_train_async(
+                args.project_path,
+                output_dir,
+                project_name,
+                ai_config,
+                ignore_dirs,
+                semaphore,
+                max_concurrency=max_concurrency
             )
+
+    try:
+        asyncio.run(_run())
     except Exception as e:
         logger.error(f"生成结构体训练样本时出错: {e}")
 
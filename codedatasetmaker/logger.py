@@ -11,15 +11,33 @@ import os
 import sys
 from datetime import datetime
 
-# 创建logs目录（如果不存在）
+# 日志目录，在首次创建日志记录器时才会创建
 LOGS_DIR = "logs"
-if not os.path.exists(LOGS_DIR):
-    os.makedirs(LOGS_DIR)
 
 # 配置日志格式
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
+# 文件日志缓冲的记录条数，达到该数量或出现ERROR及以上级别的日志时才写入文件
+FILE_BUFFER_CAPACITY = 1024
+
+# 已创建的文件日志缓冲处理器
+_buffered_handlers = []
+
+def flush_buffered_handlers():
+    """将所有缓冲中的日志记录立即写入文件"""
+    for handler in _buffered_handlers:
+        handler.flush()
+
+def clear_buffered_handlers():
+    """丢弃缓冲中的日志记录，用于子进程丢弃从父进程继承的缓冲，避免重复写入"""
+    for handler in _buffered_handlers:
+        handler.acquire()
+        try:
+            handler.buffer.clear()
+        finally:
+            handler.release()
+
 # 创建日志记录器
 def get_logger(name: str = "CodeDatasetMaker", log_file: str = None) -> logging.Logger:
     """
@@ -55,61 +73,98 @@ def get_logger(name: str = "CodeDatasetMaker", log_file: str = None) -> logging.
     if log_file is None:
         log_file = os.path.join(LOGS_DIR, f"{name}.log")
     
-    # 确保日志文件所在的目录存在
+    # 确保日志文件所在的目录存在（exist_ok可避免并发创建时的竞争）
     log_dir = os.path.dirname(log_file)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
     
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # 使用内存缓冲批量写入文件，减少每条日志一次的写入和刷新
+    # logging.handlers会导入socket、pickle等模块，只在创建日志记录器时导入
+    from logging.handlers import MemoryHandler
+    buffered_handler = MemoryHandler(
+        capacity=FILE_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    buffered_handler.setLevel(logging.DEBUG)
+    logger.addHandler(buffered_handler)
+
+    # fork前先把缓冲写入文件，子进程再丢弃继承的缓冲，避免日志丢失或重复写入
+    if not _buffered_handlers and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(before=flush_buffered_handlers, after_in_child=clear_buffered_handlers)
+    _buffered_handlers.append(buffered_handler)
     
     return logger
 
-# 创建默认的日志记录器
-default_logger = get_logger()
+# 默认的日志记录器和AI调用专用日志记录器，首次使用时才创建
+_default_logger = None
+_ai_logger = None
+
+def get_default_logger() -> logging.Logger:
+    """获取默认的日志记录器，首次使用时才创建"""
+    global _default_logger
+    if _default_logger is None:
+        _default_logger = get_logger()
+    return _default_logger
+
+def get_ai_logger() -> logging.Logger:
+    """获取AI调用专用的日志记录器，首次使用时才创建"""
+    global _ai_logger
+    if _ai_logger is None:
+        _ai_logger = get_logger("AI_Call")
+    return _ai_logger
+
+def __getattr__(name):
+    """延迟创建模块级的 default_logger / ai_logger"""
+    if name == "default_logger":
+        return get_default_logger()
+    if name == "ai_logger":
+        return get_ai_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 便捷函数
-def debug(message: str):
+# 支持 info("...: %s", value) 形式的延迟格式化，日志级别被过滤时不会拼接字符串
+def debug(message: str, *args):
     """记录调试信息"""
-    default_logger.debug(message)
+    get_default_logger().debug(message, *args)
 
-def info(message: str):
+def info(message: str, *args):
     """记录一般信息"""
-    default_logger.info(message)
+    get_default_logger().info(message, *args)
 
-def warning(message: str):
+def warning(message: str, *args):
     """记录警告信息"""
-    default_logger.warning(message)
+    get_default_logger().warning(message, *args)
 
-def error(message: str):
+def error(message: str, *args):
     """记录错误信息"""
-    default_logger.error(message)
+    get_default_logger().error(message, *args)
 
-def critical(message: str):
+def critical(message: str, *args):
     """记录严重错误信息"""
-    default_logger.critical(message)
-
-# AI调用专用日志记录器
-ai_logger = get_logger("AI_Call")
+    get_default_logger().critical(message, *args)
 
-def ai_debug(message: str):
+# AI调用专用日志记录器的便捷函数
+def ai_debug(message: str, *args):
     """记录AI调用调试信息"""
-    ai_logger.debug(message)
+    get_ai_logger().debug(message, *args)
 
-def ai_info(message: str):
+def ai_info(message: str, *args):
     """记录AI调用一般信息"""
-    ai_logger.info(message)
+    get_ai_logger().info(message, *args)
 
-def ai_warning(message: str):
+def ai_warning(message: str, *args):
     """记录AI调用警告信息"""
-    ai_logger.warning(message)
+    get_ai_logger().warning(message, *args)
 
-def ai_error(message: str):
+def ai_error(message: str, *args):
     """记录AI调用错误信息"""
-    ai_logger.error(message)
+    get_ai_logger().error(message, *args)
 
-def ai_critical(message: str):
+def ai_critical(message: str, *args):
     """记录AI调用严重错误信息"""
-    ai_logger.critical(message)
+    get_ai_logger().critical(message, *args)
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import os
 import argparse
+import re
 import sys
+import orjson
 from collections import defaultdict
 
 # 导入日志模块
@@ -13,16 +14,20 @@ from . import logger
 # 导入工具函数
 from .utils import load_json_file as utils_load_json_file
 
+# 初始化函数名匹配 (main, init, initialize, config, configure, setup, start, begin)
+# 原逻辑中的startswith/endswith都被"包含"覆盖，initialize/configure也分别包含init/config
+INIT_FUNCTION_RE = re.compile(r'main|init|config|setup|start|begin', re.IGNORECASE)
+
 
 def load_json_file(file_path):
     """加载JSON文件"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         logger.error(f"错误: 找不到文件 {file_path}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"错误: 解析JSON文件失败 {file_path}: {e}")
         sys.exit(1)
 
@@ -44,13 +49,39 @@ def get_directory(file_path):
     """获取文件所在目录"""
     return os.path.dirname(file_path)
 
-def get_file_size(file_path, source_dir):
-    """获取文件大小（字节）"""
-    try:
-        full_path = os.path.join(source_dir, file_path)
-        return os.path.getsize(full_path)
-    except OSError:
-        return 0
+def build_file_size_cache(source_dir):
+    """遍历一次项目目录，收集所有文件的大小（键为相对于项目目录的路径）"""
+    size_cache = {}
+    stack = [(source_dir, '')]
+    while stack:
+        current_dir, relative_dir = stack.pop()
+        try:
+            entries = os.scandir(current_dir)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, relative_path))
+                    elif entry.is_file(follow_symlinks=False):
+                        size_cache[relative_path] = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return size_cache
+
+def get_file_size(file_path, size_cache, source_dir):
+    """获取文件大小（字节），优先使用预先收集的文件大小缓存"""
+    size = size_cache.get(file_path)
+    if size is None:
+        # 缓存中没有（如路径不在项目目录内），单独查询并记录
+        try:
+            size = os.path.getsize(os.path.join(source_dir, file_path))
+        except OSError:
+            size = 0
+        size_cache[file_path] = size
+    return size
 
 def find_common_prefix(file_paths):
     """查找文件路径列表中的公共前缀"""
@@ -64,15 +95,7 @@ def find_common_prefix(file_paths):
         return file_names[0]
     
     # 查找公共前缀
-    prefix = ""
-    min_len = min(len(name) for name in file_names)
-    
-    for i in range(min_len):
-        char = file_names[0][i]
-        if all(name[i] == char for name in file_names):
-            prefix += char
-        else:
-            break
+    prefix = os.path.commonprefix(file_names)
     
     # 如果前缀太短，返回空字符串
     # 但如果前缀以_结尾，移除下划线
@@ -82,56 +105,129 @@ def find_common_prefix(file_paths):
         return prefix
     return ""
 
-def build_call_graph_map(call_graph):
+def split_call_graph_key(key):
+    """拆分调用图中"文件:函数"格式的键，格式不符时返回None"""
+    file_path, sep, rest = key.partition(':')
+    if not sep:
+        return None
+    return file_path, rest.partition(':')[0]
+
+def parse_call_graph(call_graph):
+    """将调用图的键一次性拆分为(调用者文件, 调用者函数, [(被调用文件, 被调用函数), ...])"""
+    parsed = []
+    for caller, callees in call_graph.items():
+        caller_parts = split_call_graph_key(caller)
+        if caller_parts is None:
+            continue
+        callee_parts = [parts for parts in map(split_call_graph_key, callees) if parts is not None]
+        parsed.append((caller_parts[0], caller_parts[1], callee_parts))
+    return parsed
+
+def build_call_graph_map(call_graph, parsed_call_graph=None):
     """构建调用图映射"""
+    if parsed_call_graph is None:
+        parsed_call_graph = parse_call_graph(call_graph)
+
     # 创建一个调用映射，方便查找
     call_map = defaultdict(set)
     reverse_call_map = defaultdict(set)
     
-    for caller, callees in call_graph.items():
-        caller_parts = caller.split(':')
-        if len(caller_parts) >= 2:
-            caller_func = caller_parts[1]
-            for callee in callees:
-                callee_parts = callee.split(':')
-                if len(callee_parts) >= 2:
-                    callee_func = callee_parts[1]
-                    call_map[caller_func].add(callee_func)
-                    reverse_call_map[callee_func].add(caller_func)
+    for _, caller_func, callees in parsed_call_graph:
+        for _, callee_func in callees:
+            call_map[caller_func].add(callee_func)
+            reverse_call_map[callee_func].add(caller_func)
     
     return call_map, reverse_call_map
 
-def find_connected_components_with_size_limit(files, file_calls, file_details, source_dir, max_size=128*1024):
+def find_connected_components_with_size_limit(files, file_calls, file_details, source_dir, size_cache, max_size=128*1024):
     """查找连通分量（模块），考虑文件大小限制"""
     visited = set()
     components = []
+    file_set = set(files)
     
-    def dfs(file_path, component, current_size):
-        visited.add(file_path)
-        component.append(file_path)
-        
-        # 计算添加此文件后的总大小
-        file_size = get_file_size(file_path, source_dir)
-        current_size[0] += file_size
-        
-        # 查找所有相连的文件
-        for neighbor in file_calls.get(file_path, []):
-            if neighbor in files and neighbor not in visited:
-                # 检查添加邻居文件是否会超过大小限制
-                neighbor_size = get_file_size(neighbor, source_dir)
-                if current_size[0] + neighbor_size <= max_size:
-                    dfs(neighbor, component, current_size)
-    
-    # 对所有文件进行DFS查找连通分量
+    # 对所有文件进行DFS查找连通分量（使用显式栈，避免递归深度限制）
     for file_path in files:
-        if file_path not in visited:
-            component = []
-            current_size = [0]  # 使用列表以便在递归中修改
-            dfs(file_path, component, current_size)
-            components.append(component)
+        if file_path in visited:
+            continue
+
+        component = []
+        current_size = 0
+        stack = [file_path]
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+
+            # 检查添加此文件是否会超过大小限制（分量的第一个文件总是加入）
+            file_size = get_file_size(current, size_cache, source_dir)
+            if component and current_size + file_size > max_size:
+                continue
+
+            visited.add(current)
+            component.append(current)
+            current_size += file_size
+
+            # 查找所有相连的文件
+            for neighbor in file_calls.get(current, ()):
+                if neighbor in file_set and neighbor not in visited:
+                    if current_size + get_file_size(neighbor, size_cache, source_dir) <= max_size:
+                        stack.append(neighbor)
+
+        components.append(component)
     
     return components
 
+def process_directory(directory, files, added_files, file_call_map, file_details, source_dir, size_cache):
+    """对单个目录中的文件进行模块划分，返回[(模块名, 文件列表), ...]"""
+    files_set = set(files)
+
+    # 构建该目录中文件的调用关系图
+    local_file_calls = defaultdict(set)
+    for file in files:
+        if file in added_files:
+            continue
+
+        if file in file_call_map:
+            # 只考虑同一目录内的调用关系
+            for called_file in file_call_map[file]:
+                if called_file in files_set:
+                    local_file_calls[file].add(called_file)
+                    local_file_calls[called_file].add(file)  # 添加反向连接
+        else:
+            logger.warning(f"File '{file}' not found in file_call_map.")
+
+    # 查找该目录中的连通分量（模块），考虑文件大小限制
+    file_components = find_connected_components_with_size_limit(files, local_file_calls, file_details, source_dir, size_cache)
+
+    # 为每个连通分量创建一个模块
+    directory_modules = []
+    for i, component in enumerate(file_components):
+        # 根据组件大小确定模块名称
+        if len(component) == 1:
+            # 单文件模块使用文件名作为模块名
+            file_name = os.path.basename(component[0])
+            # 移除文件扩展名
+            module_name = os.path.splitext(file_name)[0]
+        else:
+            # 多文件模块优先使用公共前缀
+            common_prefix = find_common_prefix(component)
+            dir_name = os.path.basename(directory) if directory else 'root'
+            
+            if common_prefix and len(common_prefix) > 2:  # 只有当前缀足够长时才使用
+                module_name = common_prefix
+            else:
+                # 如果没有明显的公共前缀，使用目录名
+                if len(file_components) > 1:
+                    # 如果同一目录下有多个多文件模块，添加数字编号
+                    module_name = f"{dir_name}_{i+1}"
+                else:
+                    # 否则直接使用目录名
+                    module_name = dir_name
+
+        directory_modules.append((module_name, [file_path for file_path in component if file_path in file_details]))
+
+    return directory_modules
+
 def analyze_module_boundaries(source_dir, output_dir):
     """分析模块边界"""
     # 构建metadata目录路径
@@ -159,20 +255,17 @@ def analyze_module_boundaries(source_dir, output_dir):
     call_graph = load_json_file(call_graph_path)
     file_info = load_json_file(file_info_path)
 
+    # 一次性收集项目中所有文件的大小，避免在模块划分时逐个stat
+    size_cache = build_file_size_cache(source_dir)
+
     # 构建文件调用图映射
     file_call_map = defaultdict(set)
 
     # 构建文件间的调用关系
-    for caller, callees in call_graph.items():
-        caller_parts = caller.split(':')
-        if len(caller_parts) >= 2:
-            caller_file = caller_parts[0]
-            for callee in callees:
-                callee_parts = callee.split(':')
-                if len(callee_parts) >= 2:
-                    callee_file = callee_parts[0]
-                    if caller_file != callee_file:
-                        file_call_map[caller_file].add(callee_file)
+    for caller_file, _, callees in parse_call_graph(call_graph):
+        for callee_file, _ in callees:
+            if caller_file != callee_file:
+                file_call_map[caller_file].add(callee_file)
 
     # 根据include关系构建调用关系，更新file_call_map
     for file_data in file_info:
@@ -197,12 +290,7 @@ def analyze_module_boundaries(source_dir, output_dir):
         file_details[file_path] = file_data
 
         # 检查是否有初始化函数 (main, init, config, setup等)
-        init_function_names = ['main', 'init', 'initialize', 'config', 'configure', 'setup', 'start', 'begin']
-        has_init_func = any(any(func['name'].lower().endswith(init_name) or 
-                               func['name'].lower().startswith(init_name) or
-                               init_name in func['name'].lower()
-                               for init_name in init_function_names)
-                           for func in file_data.get('functions', []))
+        has_init_func = any(INIT_FUNCTION_RE.search(func['name']) for func in file_data.get('functions', ()))
 
         if has_init_func:
             init_files.append(file_path)
@@ -217,6 +305,7 @@ def analyze_module_boundaries(source_dir, output_dir):
     # 分析结果存储
     modules = defaultdict(list)
     dependencies = defaultdict(set)
+    file_to_module = {}  # 文件到所属模块的索引，随modules同步更新
     module_counter = 0
     
     # 处理包含初始化函数的文件，并把它调用的同目录文件加入模块
@@ -227,6 +316,7 @@ def analyze_module_boundaries(source_dir, output_dir):
         
         # 初始化文件作为模块入口
         modules[init_module_name].append(init_file)
+        file_to_module.setdefault(init_file, init_module_name)
         added_files.add(init_file)
 
         # 分析初始化文件的依赖关系
@@ -236,6 +326,7 @@ def analyze_module_boundaries(source_dir, output_dir):
                 # 如果文件在同一个目录，且没有初始化入口则加入当前模块
                 if directory == get_directory(called_file) and called_file not in added_files:
                     modules[init_module_name].append(called_file)
+                    file_to_module.setdefault(called_file, init_module_name)
                     added_files.add(called_file)
                     # 从目录模块中删除文件
                     try:
@@ -245,91 +336,27 @@ def analyze_module_boundaries(source_dir, output_dir):
                     if not dir_files[directory]: # 如果目录模块为空，则删除该目录
                         del dir_files[directory]
 
-    # 对每个目录中的文件进行模块划分
+    # 对每个目录中的文件进行模块划分，按目录顺序合并各目录的划分结果
     for directory, files in dir_files.items():
-        # 构建该目录中文件的调用关系图
-        local_file_calls = defaultdict(set)
-        for file in files:
-            if file in added_files:
-                continue
-
-            if file in file_call_map:
-                # 只考虑同一目录内的调用关系
-                for called_file in file_call_map[file]:
-                    if called_file in files:
-                        local_file_calls[file].add(called_file)
-                        local_file_calls[called_file].add(file)  # 添加反向连接
-            else:
-                logger.warning(f"File '{file}' not found in file_call_map.")
-
-        # 查找该目录中的连通分量（模块），考虑文件大小限制
-        file_components = find_connected_components_with_size_limit(files, local_file_calls, file_details, source_dir)
-
-        # 为每个连通分量创建一个模块
-        for i, component in enumerate(file_components):
-            # 根据组件大小确定模块名称
-            if len(component) == 1:
-                # 单文件模块使用文件名作为模块名
-                file_name = os.path.basename(component[0])
-                # 移除文件扩展名
-                module_name = os.path.splitext(file_name)[0]
-            else:
-                # 多文件模块优先使用公共前缀
-                common_prefix = find_common_prefix(component)
-                dir_name = os.path.basename(directory) if directory else 'root'
-                
-                if common_prefix and len(common_prefix) > 2:  # 只有当前缀足够长时才使用
-                    module_name = common_prefix
-                else:
-                    # 如果没有明显的公共前缀，使用目录名
-                    if len(file_components) > 1:
-                        # 如果同一目录下有多个多文件模块，添加数字编号
-                        module_name = f"{dir_name}_{i+1}"
-                    else:
-                        # 否则直接使用目录名
-                        module_name = dir_name
-            
+        directory_modules = process_directory(directory, files, added_files, file_call_map, file_details, source_dir, size_cache)
+        for module_name, component in directory_modules:
             # 添加文件到模块
             for file_path in component:
-                if file_path in file_details:
-                    modules[module_name].append(file_path)
-            
-            # 分析模块间依赖关系
-            for file_path in component:
-                if file_path in file_call_map:
-                    for called_file in file_call_map[file_path]:
-                        # 如果被调用文件不在当前模块中，记录依赖关系
-                        in_current_module = False
-                        for mod_files in modules[module_name]:
-                            if called_file == mod_files:
-                                in_current_module = True
-                                break
-                        
-                        if not in_current_module:
-                            # 找到被调用文件所属的模块
-                            for other_module, other_files in modules.items():
-                                if other_module != module_name:
-                                    if called_file in other_files:
-                                        dependencies[module_name].add(other_module)
-                                        break
+                modules[module_name].append(file_path)
+                file_to_module.setdefault(file_path, module_name)
     
     # 遍历所有模块，确定他们的依赖关系
     for module_name, module_files in modules.items():
         for file in module_files:
-            if file in file_call_map:
-                called_files = file_call_map[file]
-                # 找到被调用文件所属的模块
-                for dependencies_module_name, dependencies_module_files in modules.items():
-                    if dependencies_module_name == module_name:
-                        continue
-
-                    has_common = any(x in called_files for x in dependencies_module_files)
-                    if has_common:
-                        dependencies[module_name].add(dependencies_module_name)
-                    
+            # 找到被调用文件所属的模块
+            for called_file in file_call_map.get(file, ()):
+                dependencies_module_name = file_to_module.get(called_file)
+                if dependencies_module_name is not None and dependencies_module_name != module_name:
+                    dependencies[module_name].add(dependencies_module_name)
 
     # 补充在file_info.json中存在但在调用图中未出现的文件
     all_files_in_info = set()
+    dir_name_to_module = {}  # 目录名 -> 该目录的第一个模块
     for file_data in file_info:
         file_path = file_data['file']
         if (file_path.endswith('.h') or file_path.endswith('.hpp')) and not file_data.get("functions"):
@@ -339,27 +366,25 @@ def analyze_module_boundaries(source_dir, output_dir):
         all_files_in_info.add(file_data['file'])
         
         # 查找是否已经在modules中
-        found = False
-        for module_files in modules.values():
-            if file_data['file'] in module_files:
-                found = True
-                break
-
-        if not found:
-            # 添加未在调用图中出现的文件到相应目录的模块中
-            # 找到该目录的第一个模块，或者创建一个新模块
-            directory_modules = [mod for mod in modules.keys() 
-                              if mod.startswith(os.path.basename(directory) if directory else 'root')]
-            
-            if directory_modules:
-                # 添加到该目录的第一个模块
-                module_name = directory_modules[0]
-                modules[module_name].append(file_data['file'])
-            else:
-                # 创建新模块
-                module_counter += 1
-                module_name = f"{os.path.basename(directory) if directory else 'root'}_module_{module_counter}"
-                modules[module_name].append(file_data['file'])
+        if file_data['file'] in file_to_module:
+            continue
+
+        # 添加未在调用图中出现的文件到相应目录的模块中
+        # 找到该目录的第一个模块，或者创建一个新模块
+        dir_name = os.path.basename(directory) if directory else 'root'
+        module_name = dir_name_to_module.get(dir_name)
+        if module_name is None:
+            module_name = next((mod for mod in modules.keys() if mod.startswith(dir_name)), None)
+
+        if module_name is None:
+            # 创建新模块
+            module_counter += 1
+            module_name = f"{dir_name}_module_{module_counter}"
+
+        # 新模块总是追加在末尾，已找到的"该目录的第一个模块"不会改变，可以缓存
+        dir_name_to_module[dir_name] = module_name
+        modules[module_name].append(file_data['file'])
+        file_to_module[file_data['file']] = module_name
 
     # 检查处理循环依赖
     # 首先找到从未被依赖的模块，从根模块开始处理，有效防止依赖倒换
@@ -440,27 +465,31 @@ def export_module_structure(modules, dependencies, output_dir):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # 导出模块信息
-    module_info = {}
-    for module, files in modules.items():
-        module_info[module] = {
-            'files': files,
-            'dependencies': list(dependencies.get(module, []))
-        }
-    
+    # 逐个模块写出，不再先构建完整的module_info字典，降低大项目导出时的内存峰值
+    # 输出格式与整体 orjson.dumps(..., OPT_INDENT_2) 相同
     output_file = os.path.join(output_dir, 'module_structure.json')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(module_info, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(b'{')
+        for index, (module, files) in enumerate(modules.items()):
+            module_entry = {
+                'files': files,
+                'dependencies': list(dependencies.get(module, []))
+            }
+            # JSON字符串中不会出现原始换行符，可以直接为嵌套内容增加一级缩进
+            entry_json = orjson.dumps(module_entry, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+            f.write(b',\n  ' if index else b'\n  ')
+            f.write(orjson.dumps(module) + b': ' + entry_json)
+        f.write(b'\n}' if modules else b'}')
     
     logger.info(f"\n模块结构已导出到: {output_file}")
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description='分析C项目模块边界')
     parser.add_argument('project_dir', help='项目目录路径')
     parser.add_argument('-o', '--output', help='输出目录路径')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # 验证项目目录是否存在
     if not os.path.isdir(args.project_dir):
@@ -6,20 +6,122 @@
 用于解析ARM Cortex-M系列微控制器的启动文件，提取中断向量表、入口函数等信息
 """
 import argparse
+import asyncio
+import functools
+import glob
 import os
 import sys
 import json
 import re
-from xml.etree import ElementTree as ET
 
-# 添加上级目录到Python路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# 优先使用C实现的lxml解析项目文件，未安装时退回标准库
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    from xml.etree import ElementTree as ET
+    HAS_LXML = False
+
+# 添加上级目录到Python路径（只添加一次）
+_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
 
 # 导入工具模块
-from .utils import load_ai_config, call_ai_api, save_ai_response
+from .utils import load_ai_config, call_ai_api, async_call_ai_api_stream, save_ai_response
 from . import logger
 
 
+# 常见的启动文件名
+COMMON_STARTUP_NAMES = frozenset((
+    "lcm32f037_startup.s",
+    "startup_LCM32F0xx.s",
+    "lcm32f0xx_startup.s",
+    "startup.s",
+    "startup.S"
+))
+
+# 汇编源文件后缀，用 name[-2:] in ASM_SUFFIXES 判断
+ASM_SUFFIXES = frozenset(('.s', '.S'))
+
+# 常见的项目配置文件（相对项目目录），按优先级排列
+CONFIG_FILE_PATTERNS = (
+    ("Project", "base_proj", "base.uvprojx"),
+    ("*.uvprojx",),
+    ("*.uvproj",),
+    ("*.ewp",),
+    ("Makefile",),
+    ("CMakeLists.txt",)
+)
+
+# 启动文件内容中的关键词，用于在找不到常见启动文件名时按内容识别
+STARTUP_KEYWORDS = (b'Reset_Handler', b'Vector', b'__initial_sp')
+
+# 按内容识别启动文件时，只检查文件开头的这部分内容（向量表和栈定义都位于启动文件开头）
+STARTUP_SCAN_HEAD_SIZE = 64 * 1024
+
+# 预编译的正则表达式
+VECTOR_SECTION_RE = re.compile(r'__Vectors\s+(.*?)(?:__Vectors_End|__Vectors_Size)', re.DOTALL)
+DCD_RE = re.compile(r'DCD\s+(\w+)')
+RESET_HANDLER_PROC_RE = re.compile(r'Reset_Handler\s+PROC')
+PROC_RE = re.compile(r'(\w+)\s+PROC')
+EXPORT_RE = re.compile(r'EXPORT\s+(\w+)')
+WEAK_EXPORT_RE = re.compile(r'EXPORT\s+(\w+)\s*\[WEAK\]')
+MAKEFILE_STARTUP_RE = re.compile(r'(ASM_SOURCES|STARTUP).*?=\s*(.*?\.s)', re.IGNORECASE)
+CMAKE_STARTUP_RE = re.compile(r'set\s*\(\s*(ASM_SOURCES|STARTUP).*?\s+(.*?\.s)', re.IGNORECASE | re.DOTALL)
+
+
+def iter_files(root_dir):
+    """
+    遍历目录下的所有文件，遍历顺序与os.walk相同
+    
+    Args:
+        root_dir (str): 起始目录
+        
+    Yields:
+        tuple: (文件名, 文件路径)
+    """
+    stack = [root_dir]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            entries = os.scandir(current_dir)
+        except OSError:
+            continue
+
+        sub_dirs = []
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.name, entry.path
+                except OSError:
+                    continue
+
+        # 逆序入栈，使子目录按原顺序出栈
+        stack.extend(reversed(sub_dirs))
+
+
+def contains_startup_keywords(file_path, dir_fd=None):
+    """
+    检查文件内容是否包含启动相关的关键词
+    
+    Args:
+        file_path (str): 文件路径，提供dir_fd时为相对于该目录的文件名
+        dir_fd (int): 已打开的目录描述符
+        
+    Returns:
+        bool: 包含任一关键词时返回True
+    """
+    # 只读取文件开头并按字节查找，无需读入和解码整个文件
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0), dir_fd=dir_fd)
+    with open(fd, 'rb') as f:
+        head = f.read(STARTUP_SCAN_HEAD_SIZE)
+    return any(keyword in head for keyword in STARTUP_KEYWORDS)
+
+
 def find_startup_file(project_path):
     """
     在项目中查找启动文件
@@ -30,15 +132,18 @@ def find_startup_file(project_path):
     Returns:
         str: 启动文件路径，如果未找到则返回None
     """
-    # 查找常见的启动文件名
-    common_startup_names = [
-        "lcm32f037_startup.s",
-        "startup_LCM32F0xx.s",
-        "lcm32f0xx_startup.s",
-        "startup.s",
-        "startup.S"
-    ]
-    
+    try:
+        mtime_ns = os.stat(project_path).st_mtime_ns
+    except OSError:
+        return None
+
+    # 按项目目录的修改时间缓存查找结果（包括未找到的情况），同一进程内重复查找时不再遍历目录
+    return _find_startup_file_cached(project_path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _find_startup_file_cached(project_path, mtime_ns):
+    """在项目中查找启动文件，mtime_ns仅作为缓存键"""
     # 首先尝试从项目配置文件中查找
     startup_file = find_startup_in_config(project_path)
     if startup_file and os.path.exists(startup_file):
@@ -53,28 +158,42 @@ def find_startup_file(project_path):
         project_path
     ]
     
+    # 只遍历一次目录：查找常见的启动文件名，同时记录.s/.S文件供后续按内容检查
+    asm_files = {}
     for path in search_paths:
         if os.path.exists(path):
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    if file in common_startup_names:
-                        return os.path.join(root, file)
-    
-    # 如果还是没找到，尝试查找所有.s或.S文件
-    for path in search_paths:
-        if os.path.exists(path):
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    if file.endswith(('.s', '.S')):
-                        # 检查文件内容是否包含启动相关的关键词
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                if any(keyword in content for keyword in ['Reset_Handler', 'Vector', '__initial_sp']):
-                                    return file_path
-                        except Exception as e:
-                            logger.warning(f"无法读取文件 {file_path}: {e}")
+            for file, file_path in iter_files(path):
+                if file in COMMON_STARTUP_NAMES:
+                    return file_path
+                if file[-2:] in ASM_SUFFIXES:
+                    asm_files.setdefault(file_path, file)
+    
+    # 如果还是没找到，检查所有.s或.S文件的内容是否包含启动相关的关键词
+    # 同一目录下的文件相对于已打开的目录描述符打开，避免每个文件都重新解析完整路径
+    use_dir_fd = os.open in os.supports_dir_fd
+    dir_path = None
+    dir_fd = None
+    try:
+        for file_path, file in asm_files.items():
+            try:
+                if use_dir_fd:
+                    parent_dir = os.path.dirname(file_path)
+                    if parent_dir != dir_path:
+                        if dir_fd is not None:
+                            os.close(dir_fd)
+                            dir_path = dir_fd = None
+                        dir_fd = os.open(parent_dir or '.', os.O_RDONLY)
+                        dir_path = parent_dir
+                    found = contains_startup_keywords(file, dir_fd=dir_fd)
+                else:
+                    found = contains_startup_keywords(file_path)
+                if found:
+                    return file_path
+            except Exception as e:
+                logger.warning(f"无法读取文件 {file_path}: {e}")
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
     
     return None
 
@@ -89,41 +208,38 @@ def find_startup_in_config(project_path):
     Returns:
         str: 启动文件路径，如果未找到则返回None
     """
-    # 查找常见的项目配置文件
-    config_files = [
-        os.path.join(project_path, "Project", "base_proj", "base.uvprojx"),
-        os.path.join(project_path, "*.uvprojx"),
-        os.path.join(project_path, "*.uvproj"),
-        os.path.join(project_path, "*.ewp"),
-        os.path.join(project_path, "Makefile"),
-        os.path.join(project_path, "CMakeLists.txt")
-    ]
-    
-    for config_file_pattern in config_files:
-        if '*' in config_file_pattern:
-            # 处理通配符
-            import glob
-            matches = glob.glob(config_file_pattern)
-            for config_file in matches:
-                if os.path.exists(config_file):
-                    startup_file = parse_config_for_startup(config_file)
-                    if startup_file:
-                        # 处理相对路径
-                        if not os.path.isabs(startup_file):
-                            startup_file = os.path.normpath(os.path.join(os.path.dirname(config_file), startup_file))
-                        return startup_file
-        else:
-            if os.path.exists(config_file_pattern):
-                startup_file = parse_config_for_startup(config_file_pattern)
-                if startup_file:
-                    # 处理相对路径
-                    if not os.path.isabs(startup_file):
-                        startup_file = os.path.normpath(os.path.join(os.path.dirname(config_file_pattern), startup_file))
-                    return startup_file
+    for config_file in iter_config_files(project_path):
+        startup_file = parse_config_for_startup(config_file)
+        if startup_file:
+            # 处理相对路径
+            if not os.path.isabs(startup_file):
+                startup_file = os.path.normpath(os.path.join(os.path.dirname(config_file), startup_file))
+            return startup_file
     
     return None
 
 
+def iter_config_files(project_path):
+    """
+    按优先级依次产生项目中存在的配置文件路径
+    
+    Args:
+        project_path (str): 项目路径
+        
+    Yields:
+        str: 配置文件路径
+    """
+    escaped_project_path = glob.escape(project_path)
+    for pattern in CONFIG_FILE_PATTERNS:
+        if '*' in pattern[-1]:
+            # 通配符的匹配结果必然存在，无需再检查
+            yield from glob.iglob(os.path.join(escaped_project_path, *pattern))
+        else:
+            config_file = os.path.join(project_path, *pattern)
+            if os.path.exists(config_file):
+                yield config_file
+
+
 def parse_config_for_startup(config_file):
     """
     解析配置文件以查找启动文件
@@ -134,28 +250,43 @@ def parse_config_for_startup(config_file):
     Returns:
         str: 启动文件路径，如果未找到则返回None
     """
+    try:
+        mtime_ns = os.stat(config_file).st_mtime_ns
+    except OSError as e:
+        logger.warning(f"解析配置文件 {config_file} 时出错: {e}")
+        return None
+
+    # 按修改时间缓存解析结果，配置文件未修改时不再重复解析
+    return _parse_config_cached(config_file, mtime_ns)
+
 
+@functools.lru_cache(maxsize=128)
+def _parse_config_cached(config_file, mtime_ns):
+    """解析配置文件以查找启动文件，mtime_ns仅作为缓存键"""
     try:
         if config_file.endswith(('.uvprojx', '.uvproj')):
-            # 解析Keil项目文件
-            tree = ET.parse(config_file)
-            root = tree.getroot()
-            
-            # 查找startup组中的启动文件
-            for targets in root.iter('Targets'):
-                for target in targets.iter('Target'):
-                    for groups in target.iter('Groups'):
-                        for group in groups.iter('Group'):
-                            group_name = group.find('GroupName')
-                            if group_name is not None and group_name.text == 'startup':
-                                # 在startup组中查找文件
-                                for files_elem in group.iter('Files'):
-                                    for file_elem in files_elem.iter('File'):
-                                        file_path_elem = file_elem.find('FilePath')
-                                        if file_path_elem is not None:
-                                            file_path = file_path_elem.text
-                                            if file_path and file_path.endswith(('.s', '.S')):
-                                                return file_path.replace('\\', '/')
+            # 解析Keil项目文件，流式读取，每个Group处理完后立即释放
+            if HAS_LXML:
+                # lxml只为Group元素产生事件
+                events = ET.iterparse(config_file, events=('end',), tag='Group')
+            else:
+                events = ET.iterparse(config_file, events=('end',))
+
+            for _, elem in events:
+                if elem.tag != 'Group':
+                    continue
+
+                # 查找startup组中的启动文件
+                if elem.findtext('GroupName') == 'startup':
+                    for file_path_elem in elem.iterfind('.//File/FilePath'):
+                        file_path = file_path_elem.text
+                        if file_path and file_path[-2:] in ASM_SUFFIXES:
+                            return file_path.replace('\\', '/')
+                elem.clear()
+                if HAS_LXML:
+                    # 同时删除已处理的兄弟节点，避免空的Group元素在父节点中累积
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
                         
         elif config_file.endswith('.ewp'):
             # 解析IAR项目文件
@@ -166,7 +297,7 @@ def parse_config_for_startup(config_file):
             for file_elem in root.iter('file'):
                 if 'name' in file_elem.attrib:
                     file_path = file_elem.attrib['name']
-                    if 'startup' in file_path.lower() and file_path.endswith(('.s', '.S')):
+                    if 'startup' in file_path.lower() and file_path[-2:] in ASM_SUFFIXES:
                         return file_path
                         
         elif config_file.endswith('Makefile'):
@@ -174,7 +305,7 @@ def parse_config_for_startup(config_file):
             with open(config_file, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
                 # 查找ASM_SOURCES或STARTUP相关的行
-                match = re.search(r'(ASM_SOURCES|STARTUP).*?=\s*(.*?\.s)', content, re.IGNORECASE)
+                match = MAKEFILE_STARTUP_RE.search(content)
                 if match:
                     return match.group(2)
                     
@@ -183,7 +314,7 @@ def parse_config_for_startup(config_file):
             with open(config_file, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
                 # 查找汇编源文件
-                match = re.search(r'set\s*\(\s*(ASM_SOURCES|STARTUP).*?\s+(.*?\.s)', content, re.IGNORECASE | re.DOTALL)
+                match = CMAKE_STARTUP_RE.search(content)
                 if match:
                     return match.group(2)
     except Exception as e:
@@ -200,15 +331,12 @@ def extract_startup_info(startup_file_path):
         startup_file_path (str): 启动文件路径
         
     Returns:
-        dict: 包含启动文件信息的字典
+        dict: 包含启动文件路径和大小的字典，文件内容在生成提示词时才读取
     """
     try:
-        with open(startup_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
         return {
-            "content": content,
-            "startup_file": startup_file_path
+            "startup_file": startup_file_path,
+            "size": os.path.getsize(startup_file_path)
         }
     except Exception as e:
         logger.error(f"提取启动文件信息时出错: {e}")
@@ -228,13 +356,13 @@ def extract_vector_table(content):
     vector_table = []
     
     # 查找中断向量表区域，使用更精确的正则表达式
-    vector_section_match = re.search(r'__Vectors\s+(.*?)(__Vectors_End|__Vectors_Size)', content, re.DOTALL)
+    vector_section_match = VECTOR_SECTION_RE.search(content)
     
     if vector_section_match:
         vector_content = vector_section_match.group(1)
         # 提取DCD指令后的函数名
         # 使用更精确的正则表达式匹配DCD指令，包括可能的注释和空格
-        dcd_matches = re.findall(r'DCD\s+(\w+)', vector_content)
+        dcd_matches = DCD_RE.findall(vector_content)
         for i, func_name in enumerate(dcd_matches):
             vector_table.append({
                 "index": i,
@@ -255,15 +383,15 @@ def extract_entry_function(content):
         str: 入口函数名
     """
     # 查找Reset_Handler作为入口函数
-    reset_handler_match = re.search(r'Reset_Handler\s+PROC', content)
+    reset_handler_match = RESET_HANDLER_PROC_RE.search(content)
     if reset_handler_match:
         return "Reset_Handler"
     
     # 查找其他可能的入口函数
-    entry_matches = re.findall(r'(\w+)\s+PROC', content)
-    if entry_matches:
-        # 通常第一个PROC就是入口函数
-        return entry_matches[0]
+    # 通常第一个PROC就是入口函数
+    entry_match = PROC_RE.search(content)
+    if entry_match:
+        return entry_match.group(1)
     
     return None
 
@@ -278,14 +406,8 @@ def extract_exported_functions(content):
     Returns:
         list: 导出函数列表
     """
-    exported_functions = []
-    
     # 查找EXPORT指令后的函数名
-    export_matches = re.findall(r'EXPORT\s+(\w+)', content)
-    for func_name in export_matches:
-        exported_functions.append(func_name)
-    
-    return exported_functions
+    return EXPORT_RE.findall(content)
 
 
 def extract_weak_functions(content):
@@ -298,57 +420,44 @@ def extract_weak_functions(content):
     Returns:
         list: WEAK函数列表
     """
-    weak_functions = []
-    
     # 查找带有[WEAK]标记的EXPORT指令
-    weak_matches = re.findall(r'EXPORT\s+(\w+)\s*\[WEAK\]', content)
-    for func_name in weak_matches:
-        weak_functions.append(func_name)
-    
-    return weak_functions
+    return WEAK_EXPORT_RE.findall(content)
 
 
-def generate_ai_prompt(startup_info):
-    """
-    生成AI分析的提示词
-    
-    Args:
-        startup_info (dict): 启动文件信息
-        
-    Returns:
-        str: AI提示词
-    """
-    prompt = f"""请分析以下ARM Cortex-M微控制器启动文件的内容，并以严格的JSON格式输出结果：
+# AI分析提示词模板，按顺序拼接：头部 + 启动文件路径 + 中部 + 启动文件内容 + 尾部
+STARTUP_PROMPT_HEAD = """请分析以下ARM Cortex-M微控制器启动文件的内容，并以严格的JSON格式输出结果：
 
-启动文件路径: {startup_info.get('startup_file', 'Unknown')}
+启动文件路径: """
+STARTUP_PROMPT_MIDDLE = """
 
 启动文件原始内容:
 ```
-{startup_info.get('content', '')}
+"""
+STARTUP_PROMPT_TAIL = """
 ```
 
 请从上述启动文件中提取以下信息，并按照以下JSON格式输出分析结果：
-{{
+{
   "vector_table": [
-    {{
+    {
       "index": 0,
       "handler": "函数名",
       "description": "中断处理函数描述"
-    }}
+    }
   ],
   "entry_function": "入口函数名",
   "entry_function_calls": [
     "被入口函数调用的函数名"
   ],
   "exported_functions": [
-    {{
+    {
       "name": "函数名",
       "description": "函数描述",
       "is_weak": true
-    }}
+    }
   ],
   "analysis": "整体分析描述"
-}}
+}
 
 请注意：
 - entry_function_calls: 入口函数（通常是Reset_Handler）调用的函数列表
@@ -357,77 +466,105 @@ def generate_ai_prompt(startup_info):
 
 请确保输出是严格的JSON格式，不要包含任何额外的文本或解释。
 """
-    
-    return prompt
 
 
-def main(argv=None):
-    if argv is None:
-        argv = sys.argv[1:]
+def generate_ai_prompt(startup_info):
+    """
+    生成AI分析的提示词
+    
+    Args:
+        startup_info (dict): 启动文件信息，未包含content时从startup_file读取内容
         
-    parser = argparse.ArgumentParser(description='Generate function call graph for C project')
-    parser.add_argument('project_dir', help='Path to the C project directory')
-    parser.add_argument('--output', '-o', help='Output directory path')
-    args = parser.parse_args(argv)
+    Returns:
+        str: AI提示词，读取启动文件失败时返回None
+    """
+    startup_file = startup_info.get('startup_file')
+    content = startup_info.get('content')
+    if content is None:
+        # 直接读入提示词，启动文件内容在内存中只保留这一份
+        try:
+            with open(startup_file, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            logger.error(f"读取启动文件时出错: {e}")
+            return None
+
+    # 一次拼接生成提示词，避免对可能很大的启动文件内容做多次格式化复制
+    prompt = ''.join((
+        STARTUP_PROMPT_HEAD,
+        str(startup_file or 'Unknown'),
+        STARTUP_PROMPT_MIDDLE,
+        content,
+        STARTUP_PROMPT_TAIL
+    ))
+    
+    return prompt
 
-    project_path = args.project_dir
-    output_dir = args.output or "output"
 
-    # 如果没有提供项目路径，则从命令行参数获取
-    if project_path is None:
-        if not os.path.exists(project_path):
-            print(f"错误: 项目路径不存在: {project_path}")
-            sys.exit(1)
+def prepare_startup_analysis(project_path, output_dir):
+    """
+    查找并读取启动文件，生成AI提示词
     
+    Args:
+        project_path (str): 项目路径
+        output_dir (str): 输出目录
+        
+    Returns:
+        tuple: (是否成功, 提示词, 项目输出目录, 结果文件路径)，
+               失败或已存在分析结果时提示词为None
+    """
     logger.info(f"正在分析项目Startup: {project_path}")
     
+    project_name = os.path.basename(os.path.abspath(project_path))
+    project_output_dir = os.path.join(output_dir, project_name)
+
+    # 已有分析结果时，无需查找启动文件和生成提示词
+    result_file = os.path.join(project_output_dir, 'startup_analysis_result.json')
+    if os.path.exists(result_file):
+        logger.info(f"Result file {result_file} already exists. Skipping analysis.")
+        return True, None, project_output_dir, result_file
+
     # 查找启动文件
     startup_file = find_startup_file(project_path)
     if not startup_file:
         logger.error("未找到启动文件")
-        return False
+        return False, None, project_output_dir, result_file
     
     logger.info(f"找到启动文件: {startup_file}")
     
+    # 创建项目特定的输出目录（同时确保output目录存在）
+    if not os.path.exists(project_output_dir):
+        os.makedirs(project_output_dir, exist_ok=True)
+
     # 提取启动文件信息
     startup_info = extract_startup_info(startup_file)
     if not startup_info:
         logger.error("无法提取启动文件信息")
-        return False
+        return False, None, project_output_dir, result_file
     
     # 生成AI提示词
     prompt = generate_ai_prompt(startup_info)
-    
-    # 确保output目录存在
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    if prompt is None:
+        return False, None, project_output_dir, result_file
 
-    # 创建项目特定的输出目录
-    project_name = os.path.basename(os.path.abspath(project_path))
-    project_output_dir = os.path.join(output_dir, project_name)
-    if not os.path.exists(project_output_dir):
-        os.makedirs(project_output_dir)
+    return True, prompt, project_output_dir, result_file
 
-    result_file = os.path.join(project_output_dir, 'startup_analysis_result.json')
-    if os.path.exists(result_file):
-        logger.info(f"Result file {result_file} already exists. Skipping analysis.")
-        return True
 
-    # 加载AI配置
-    ai_config = load_ai_config()
-    if not ai_config:
-        # 如果没有AI配置，只保存提示词
-        prompt_file = os.path.join(project_output_dir, 'startup_analysis_prompt.txt')
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt)
-        logger.info(f"已生成提示词文件: {prompt_file}")
-        return True
+def save_prompt_file(prompt, project_output_dir):
+    """保存提示词文件"""
+    prompt_file = os.path.join(project_output_dir, 'startup_analysis_prompt.txt')
+    with open(prompt_file, 'w', encoding='utf-8') as f:
+        f.write(prompt)
+    logger.info(f"已生成提示词文件: {prompt_file}")
 
-    # 调用AI API
-    logger.info("正在调用AI分析...")
-    response = call_ai_api(prompt, ai_config)
 
-    # 保存AI响应
+def save_startup_analysis(response, prompt, project_output_dir, result_file):
+    """
+    保存AI分析结果，AI分析失败时只保存提示词
+    
+    Returns:
+        bool: 保存AI分析结果失败时返回False
+    """
     if response:
         success = save_ai_response(response, result_file)
         if success:
@@ -437,14 +574,113 @@ def main(argv=None):
             return False
     else:
         logger.warning("AI分析失败，只保存提示词")
-        prompt_file = os.path.join(project_output_dir, 'startup_analysis_prompt.txt')
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt)
-        logger.info(f"已生成提示词文件: {prompt_file}")
+        save_prompt_file(prompt, project_output_dir)
 
     return True
 
 
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+        
+    parser = argparse.ArgumentParser(description='Generate function call graph for C project')
+    parser.add_argument('project_dir', help='Path to the C project directory')
+    parser.add_argument('--output', '-o', help='Output directory path')
+    args = parser.parse_args(argv)
+
+    project_path = args.project_dir
+    output_dir = args.output or "output"
+
+    # 如果没有提供项目路径，则从命令行参数获取
+    if project_path is None:
+        if not os.path.exists(project_path):
+            print(f"错误: 项目路径不存在: {project_path}")
+            sys.exit(1)
+    
+    success, prompt, project_output_dir, result_file = prepare_startup_analysis(project_path, output_dir)
+    if prompt is None:
+        return success
+
+    # 加载AI配置
+    ai_config = load_ai_config()
+    if not ai_config:
+        # 如果没有AI配置，只保存提示词
+        save_prompt_file(prompt, project_output_dir)
+        return True
+
+    # 调用AI API
+    logger.info("正在调用AI分析...")
+    response = call_ai_api(prompt, ai_config)
+
+    # 保存AI响应
+    return save_startup_analysis(response, prompt, project_output_dir, result_file)
+
+
+async def analyze_startup_async(project_path, output_dir, ai_config, semaphore):
+    """异步分析单个项目的启动文件"""
+    # 查找启动文件、生成提示词涉及文件系统操作，放到线程中执行
+    success, prompt, project_output_dir, result_file = await asyncio.to_thread(
+        prepare_startup_analysis, project_path, output_dir
+    )
+    if prompt is None:
+        return success
+
+    if not ai_config:
+        # 如果没有AI配置，只保存提示词
+        save_prompt_file(prompt, project_output_dir)
+        return True
+
+    logger.info(f"正在调用AI分析: {project_path}")
+    response = await async_call_ai_api_stream(prompt, ai_config, semaphore)
+
+    return save_startup_analysis(response, prompt, project_output_dir, result_file)
+
+
+async def main_async(project_paths, output_dir="output", max_concurrency=None):
+    """
+    并发分析多个项目的启动文件
+    
+    Args:
+        project_paths (list): 项目路径列表
+        output_dir (str): 输出目录
+        max_concurrency (int): 最大并发AI调用数，默认使用AI配置中的max_concurrency
+        
+    Returns:
+        list: 每个项目的分析是否成功
+    """
+    ai_config = load_ai_config()
+    if max_concurrency is None:
+        max_concurrency = ai_config.get("max_concurrency", 5) if ai_config else 5
+
+    # 所有项目共用一个信号量，统一限制AI调用并发数
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(*[
+        analyze_startup_async(project_path, output_dir, ai_config, semaphore)
+        for project_path in project_paths
+    ], return_exceptions=True)
+
+    # 单个项目出错不影响其他项目的结果，出错的项目记为失败
+    for i, (project_path, result) in enumerate(zip(project_paths, results)):
+        if isinstance(result, BaseException):
+            logger.error(f"项目 {project_path} 启动文件分析出错: {result}")
+            results[i] = False
+    return results
+
+
+def batch_main(argv=None):
+    """批量分析多个项目的启动文件"""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description='Parse startup files of multiple C projects concurrently')
+    parser.add_argument('project_dirs', nargs='+', help='Paths to the C project directories')
+    parser.add_argument('--output', '-o', help='Output directory path')
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(main_async(args.project_dirs, args.output or "output"))
+    return all(results)
+
+
 if __name__ == "__main__":
     success = main()
     if success:
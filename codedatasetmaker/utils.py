@@ -6,51 +6,122 @@
 包含项目中通用的工具函数
 """
 
-import json
+import asyncio
+import functools
 import os
-from openai import OpenAI, AsyncOpenAI
+import sys
+import weakref
+import httpx
+import orjson
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 from openai import APIError, APIConnectionError, RateLimitError
 
 # 导入日志模块
 from . import logger
 
 
+# 流式输出到控制台时，每收到这么多个片段刷新一次stdout
+STREAM_FLUSH_INTERVAL = 64
+
+# AI客户端连接池大小，并发的流式请求共用同一个连接池
+AI_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+
+
 def load_json_file(file_path):
     """加载JSON文件"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         logger.error(f"错误: 找不到文件 {file_path}")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"错误: JSON解析失败 {file_path}: {e}")
         return None
 
 
-def load_ai_config(config_path="ai_config.json"):
-    """加载AI配置文件"""
-    
-    # 首先尝试从环境变量获取API密钥
-    api_key = os.environ.get("OPENAI_API_KEY")
-    
+@functools.lru_cache(maxsize=None)
+def _read_ai_config_file(config_path):
+    """读取并解析AI配置文件，同一路径在进程内只解析一次"""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # 如果环境变量中有API密钥，则使用环境变量中的值
-        if api_key:
-            config["api_key"] = api_key
-            
-        return config
+        with open(config_path, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         logger.warning(f"警告: 找不到配置文件 {config_path}，将仅生成提示词文件")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"错误: JSON解析失败 {config_path}: {e}")
         return None
 
 
+def load_ai_config(config_path="ai_config.json"):
+    """加载AI配置文件"""
+    config = _read_ai_config_file(config_path)
+    if config is None:
+        return None
+
+    # 返回副本，避免调用方修改缓存中的配置
+    config = dict(config)
+    
+    # 如果环境变量中有API密钥，则使用环境变量中的值
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if api_key:
+        config["api_key"] = api_key
+        
+    return config
+
+
+@functools.lru_cache(maxsize=4)
+def get_ai_client(api_key, base_url):
+    """获取同步AI客户端，相同的api_key和base_url复用同一个客户端"""
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultHttpxClient(limits=AI_HTTP_LIMITS),
+    )
+
+
+# 事件循环 -> (该循环上的异步客户端字典, 关闭客户端的异步生成器)
+# 以弱引用为键，事件循环被回收后对应条目自动移除
+_async_ai_clients = weakref.WeakKeyDictionary()
+
+
+async def _close_async_ai_clients(clients):
+    """挂起到事件循环关闭前，asyncio.run 调用 shutdown_asyncgens 时关闭该循环上的所有异步客户端"""
+    try:
+        yield
+    finally:
+        for client in clients.values():
+            await client.close()
+        # 生成器持有事件循环的finalizer引用，须主动移除条目，否则事件循环无法被回收
+        _async_ai_clients.pop(asyncio.get_running_loop(), None)
+
+
+async def get_async_ai_client(api_key, base_url):
+    """
+    获取异步AI客户端，相同的api_key和base_url复用同一个客户端
+    异步连接池绑定在事件循环上，因此每个事件循环各自缓存，并在事件循环结束时关闭
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_ai_clients.get(loop)
+    if entry is None:
+        clients = {}
+        closer = _close_async_ai_clients(clients)
+        _async_ai_clients[loop] = (clients, closer)
+        await closer.__anext__()
+    else:
+        clients = entry[0]
+
+    client = clients.get((api_key, base_url))
+    if client is None:
+        client = clients[(api_key, base_url)] = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=DefaultAsyncHttpxClient(limits=AI_HTTP_LIMITS),
+        )
+    return client
+
+
 def get_ignore_dirs(config):
     """获取忽略目录列表"""
     if config is None:
@@ -84,14 +155,11 @@ async def async_call_ai_api_stream(
         logger.warning("缺少 api_key，跳过 AI 调用")
         return None
 
-    client = AsyncOpenAI(
-        api_key=api_key,
-        base_url=base_url,
-    )
+    client = await get_async_ai_client(api_key, base_url)
 
     messages = [{"role": "user", "content": prompt}]
 
-    full_response = ""
+    parts = []
 
     async with semaphore:
         try:
@@ -112,7 +180,7 @@ async def async_call_ai_api_stream(
                     continue
 
                 token = delta.content
-                full_response += token
+                parts.append(token)
 
                 # 🔥 实时输出
                 if stream_printer:
@@ -120,7 +188,7 @@ async def async_call_ai_api_stream(
 
             return {
                 "choices": [
-                    {"message": {"content": full_response}}
+                    {"message": {"content": "".join(parts)}}
                 ]
             }
 
@@ -153,11 +221,8 @@ def call_ai_api(prompt, config):
         logger.warning("警告: 配置文件中缺少有效的api_key，将仅生成提示词文件")
         return None
     
-    # 创建OpenAI客户端
-    client = OpenAI(
-        api_key=api_key,
-        base_url=base_url
-    )
+    # 获取OpenAI客户端
+    client = get_ai_client(api_key, base_url)
     
     # 构造消息
     messages = [{"role": "user", "content": prompt}]
@@ -175,16 +240,20 @@ def call_ai_api(prompt, config):
             stream=True  # 启用流式响应
         )
         
-        # 流式输出响应
-        full_response = ""
+        # 流式输出响应，片段先收集到列表中，最后一次拼接
+        parts = []
+        write = sys.stdout.write
         for chunk in response:
             if chunk.choices and chunk.choices[0].delta.content:
                 content = chunk.choices[0].delta.content
-                print(content, end="", flush=True)  # 实时输出到控制台
-                full_response += content
+                write(content)  # 实时输出到控制台
+                parts.append(content)
+                if len(parts) % STREAM_FLUSH_INTERVAL == 0:
+                    sys.stdout.flush()
         
-        print()  # 添加换行
-        return {"choices": [{"message": {"content": full_response}}]}
+        write("\n")  # 添加换行
+        sys.stdout.flush()
+        return {"choices": [{"message": {"content": "".join(parts)}}]}
         
     except RateLimitError as e:
         logger.ai_error(f"请求频率过高: {e}")
@@ -216,8 +285,8 @@ def save_ai_response(response, output_path):
             return True
         else:
             # 保存原始响应
-            with open(output_path + ".raw.json", 'w', encoding='utf-8') as f:
-                json.dump(response, f, ensure_ascii=False, indent=2)
+            with open(output_path + ".raw.json", 'wb') as f:
+                f.write(orjson.dumps(response, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             return False
     except Exception as e:
         logger.error(f"错误: 保存AI响应失败: {e}")
@@ -2,445 +2,382 @@
 
 import sys
 import os
-import argparse
+import functools
+import glob
+import importlib
 
-# 添加codedatasetmaker目录到Python路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
+# 添加codedatasetmaker目录到Python路径（只添加一次）
+_CDM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'codedatasetmaker')
+if _CDM_DIR not in sys.path:
+    sys.path.insert(0, _CDM_DIR)
 
 # 导入日志模块
 from codedatasetmaker import logger
 
+
+def _cached_import(name):
+    """导入codedatasetmaker子模块，已导入时直接从sys.modules中获取"""
+    module = sys.modules.get(f'codedatasetmaker.{name}')
+    if module is None:
+        module = importlib.import_module(f'codedatasetmaker.{name}')
+    return module
+
+
+def _guard(label):
+    """捕获功能执行时的异常并记录错误日志"""
+    log_error = logger.error
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                log_error("%s执行出错: %s", label, e)
+        return wrapper
+    return decorator
+
+
 def analyze_project(project_dir, args):
     """运行代码分析功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入c_graph模块并运行
-    from codedatasetmaker import c_graph
+    c_graph = _cached_import('c_graph')
     c_graph.main([project_dir] + args)
 
 def split_modules(project_dir, args):
     """运行模块分割功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入module_splitter模块
-    from codedatasetmaker import module_splitter
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
+    module_splitter = _cached_import('module_splitter')
     
-    # 设置新的sys.argv
-    sys.argv = ['module_splitter.py', project_dir] + args
-    
-    module_splitter.main()
+    module_splitter.main([project_dir] + args)
+
 
+def analyze_and_split(project_dir, args):
+    """对单个项目依次运行代码分析和模块分割功能"""
+    analyze_project(project_dir, args)
+    split_modules(project_dir, args)
 
+
+def analyze_and_split_checked(project_dir, args):
+    """
+    运行analyze_and_split，子模块调用sys.exit时转换为RuntimeError
+    批量分析时单个项目失败只记录错误，不中断其他项目
+    """
+    try:
+        analyze_and_split(project_dir, args)
+    except SystemExit as e:
+        raise RuntimeError(f"{project_dir} 分析中途退出 (exit code {e.code})") from None
+
+
+def analyze_and_split_in_worker(project_dir, args):
+    """
+    在进程池的子进程中运行analyze_and_split
+    子进程退出时不会执行logging.shutdown，返回前先将缓冲的日志写入文件
+    """
+    try:
+        analyze_and_split_checked(project_dir, args)
+    finally:
+        logger.flush_buffered_handlers()
+
+
+@_guard("模块文档生成功能")
 def generate_module_docs(project_dir, args):
     """运行模块文档生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_module_docs模块
-    from codedatasetmaker import generate_module_docs
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_module_docs.py', project_dir] + args
+    generate_module_docs = _cached_import('generate_module_docs')
     
-    try:
-        # 运行模块文档生成功能
-        generate_module_docs.main()
-    except Exception as e:
-        logger.error(f"模块文档生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行模块文档生成功能
+    generate_module_docs.main([project_dir] + args)
 
 
+@_guard("函数文档生成功能")
 def generate_function_docs(project_dir, args):
     """运行函数文档生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_function_docs模块
-    from codedatasetmaker import generate_function_docs
+    generate_function_docs = _cached_import('generate_function_docs')
     
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_function_docs.py', project_dir] + args
-    
-    try:
-        # 运行函数文档生成功能
-        generate_function_docs.main()
-    except Exception as e:
-        logger.error(f"函数文档生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行函数文档生成功能
+    generate_function_docs.main([project_dir] + args)
 
 
+@_guard("宏文档生成功能")
 def generate_macro_docs(project_dir, args):
     """运行宏文档生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_macro_docs模块
-    from codedatasetmaker import generate_macro_docs
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
+    generate_macro_docs = _cached_import('generate_macro_docs')
     
-    # 设置新的sys.argv
-    sys.argv = ['generate_macro_docs.py', project_dir] + args
-    
-    try:
-        # 运行宏文档生成功能
-        generate_macro_docs.main()
-    except Exception as e:
-        logger.error(f"宏文档生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行宏文档生成功能
+    generate_macro_docs.main([project_dir] + args)
 
 
+@_guard("结构体文档生成功能")
 def generate_struct_docs(project_dir, args):
     """运行结构体文档生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_struct_docs模块
-    from codedatasetmaker import generate_struct_docs
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
+    generate_struct_docs = _cached_import('generate_struct_docs')
     
-    # 设置新的sys.argv
-    sys.argv = ['generate_struct_docs.py', project_dir] + args
-    
-    try:
-        # 运行结构体文档生成功能
-        generate_struct_docs.main()
-    except Exception as e:
-        logger.error(f"结构体文档生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行结构体文档生成功能
+    generate_struct_docs.main([project_dir] + args)
 
 
+@_guard("全局变量文档生成功能")
 def generate_global_var_docs(project_dir, args):
     """运行全局变量文档生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_global_var_docs模块
-    from codedatasetmaker import generate_global_var_docs
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
+    generate_global_var_docs = _cached_import('generate_global_var_docs')
     
-    # 设置新的sys.argv
-    sys.argv = ['generate_global_var_docs.py', project_dir] + args
-    
-    try:
-        # 运行全局变量文档生成功能
-        generate_global_var_docs.main()
-    except Exception as e:
-        logger.error(f"全局变量文档生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行全局变量文档生成功能
+    generate_global_var_docs.main([project_dir] + args)
 
 
 def parse_startup(project_dir, args):
     """运行启动文件解析功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入parse_startup模块
-    from codedatasetmaker import parse_startup
+    parse_startup = _cached_import('parse_startup')
     
     parse_startup.main([project_dir] + args)
 
 
+def parse_startup_batch(project_dirs, args):
+    """并发运行多个项目的启动文件解析功能"""
+    # 导入parse_startup模块
+    parse_startup = _cached_import('parse_startup')
+    
+    parse_startup.batch_main(project_dirs + args)
+
+
+@_guard("启动流程文档生成功能")
 def generate_startup_docs(project_dir, args):
     """运行启动流程文档生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_startup_docs模块
-    from codedatasetmaker import generate_startup_docs
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_startup_docs.py', project_dir] + args
+    generate_startup_docs = _cached_import('generate_startup_docs')
     
-    try:
-        # 运行启动流程文档生成功能
-        generate_startup_docs.main()
-    except Exception as e:
-        logger.error(f"启动流程文档生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行启动流程文档生成功能
+    generate_startup_docs.main([project_dir] + args)
 
 
+@_guard("启动流程训练样本生成功能")
 def generate_startup_train(project_dir, args):
     """运行启动流程训练样本生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_startup_train模块
-    from codedatasetmaker import generate_startup_train
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_startup_train.py', project_dir] + args
+    generate_startup_train = _cached_import('generate_startup_train')
     
-    try:
-        # 运行启动流程训练样本生成功能
-        generate_startup_train.main()
-    except Exception as e:
-        logger.error(f"启动流程训练样本生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行启动流程训练样本生成功能
+    generate_startup_train.main([project_dir] + args)
 
 
+@_guard("模块训练样本生成功能")
 def generate_module_train(project_dir, args):
     """运行模块训练样本生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_module_train模块
-    from codedatasetmaker import generate_module_train
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_module_train.py', project_dir] + args
+    generate_module_train = _cached_import('generate_module_train')
     
-    try:
-        # 运行模块训练样本生成功能
-        generate_module_train.main()
-    except Exception as e:
-        logger.error(f"模块训练样本生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行模块训练样本生成功能
+    generate_module_train.main([project_dir] + args)
 
 
+@_guard("结构体训练样本生成功能")
 def generate_struct_train(project_dir, args):
     """运行结构体训练样本生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_struct_train模块
-    from codedatasetmaker import generate_struct_train
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_struct_train.py', project_dir] + args
+    generate_struct_train = _cached_import('generate_struct_train')
     
-    try:
-        # 运行结构体训练样本生成功能
-        generate_struct_train.main()
-    except Exception as e:
-        logger.error(f"结构体训练样本生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行结构体训练样本生成功能
+    generate_struct_train.main([project_dir] + args)
 
 
+@_guard("函数训练样本生成功能")
 def generate_function_train(project_dir, args):
     """运行函数训练样本生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_function_train模块
-    from codedatasetmaker import generate_function_train
+    generate_function_train = _cached_import('generate_function_train')
     
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_function_train.py', project_dir] + args
-    
-    try:
-        # 运行函数训练样本生成功能
-        generate_function_train.main()
-    except Exception as e:
-        logger.error(f"函数训练样本生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行函数训练样本生成功能
+    generate_function_train.main([project_dir] + args)
 
 
+@_guard("全局变量训练样本生成功能")
 def generate_global_var_train(project_dir, args):
     """运行全局变量训练样本生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_global_var_train模块
-    from codedatasetmaker import generate_global_var_train
+    generate_global_var_train = _cached_import('generate_global_var_train')
     
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_global_var_train.py', project_dir] + args
-    
-    try:
-        # 运行全局变量训练样本生成功能
-        generate_global_var_train.main()
-    except Exception as e:
-        logger.error(f"全局变量训练样本生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    # 运行全局变量训练样本生成功能
+    generate_global_var_train.main([project_dir] + args)
 
 
+@_guard("宏定义训练样本生成功能")
 def generate_macro_train(project_dir, args):
     """运行宏定义训练样本生成功能"""
-    # 添加codedatasetmaker目录到Python路径
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codedatasetmaker'))
-    
     # 导入generate_macro_train模块
-    from codedatasetmaker import generate_macro_train
-    
-    # 保存原始的sys.argv
-    original_argv = sys.argv[:]
-    
-    # 设置新的sys.argv
-    sys.argv = ['generate_macro_train.py', project_dir] + args
-    
-    try:
-        # 运行宏定义训练样本生成功能
-        generate_macro_train.main()
-    except Exception as e:
-        logger.error(f"宏定义训练样本生成功能执行出错: {e}")
-    finally:
-        # 恢复原始的sys.argv
-        sys.argv = original_argv
+    generate_macro_train = _cached_import('generate_macro_train')
+    
+    # 运行宏定义训练样本生成功能
+    generate_macro_train.main([project_dir] + args)
+
+
+# 运行模式到对应功能的映射（analyze模式在main中单独处理）
+_DISPATCH = {
+    'doc': generate_module_docs,
+    'f_doc': generate_function_docs,
+    'm_doc': generate_macro_docs,
+    's_doc': generate_struct_docs,
+    'g_doc': generate_global_var_docs,
+    'startup': parse_startup,
+    'startup_doc': generate_startup_docs,
+    'startup_train': generate_startup_train,
+    'module_train': generate_module_train,
+    'struct_train': generate_struct_train,
+    'function_train': generate_function_train,
+    'global_var_train': generate_global_var_train,
+    'macro_train': generate_macro_train,
+}
+
+# 各运行模式的说明，用于生成--mode的帮助信息
+_MODE_DESCRIPTIONS = {
+    'analyze': '代码分析',
+    'doc': '生成模块文档',
+    'f_doc': '生成函数文档',
+    'm_doc': '生成宏文档',
+    's_doc': '生成结构体文档',
+    'g_doc': '生成全局变量文档',
+    'startup': '解析启动文件',
+    'startup_doc': '生成启动流程文档',
+    'startup_train': '生成启动流程训练样本',
+    'module_train': '生成模块训练样本',
+    'struct_train': '生成结构体训练样本',
+    'function_train': '生成函数训练样本',
+    'global_var_train': '生成全局变量训练样本',
+    'macro_train': '生成宏定义训练样本',
+}
+
+_DESCRIPTION = 'CodeDatasetMaker - C/C++项目分析工具'
+_PROJECT_DIR_HELP = '项目目录路径'
+
+# 可选参数定义：(参数名, 元变量, 帮助信息, 其他argparse参数)
+# 解析器和帮助信息都由该表生成，保证两者一致
+_OPTIONS = (
+    (('--mode', '-m'), 'MODE', '运行模式 (默认: analyze):', {'choices': _MODE_DESCRIPTIONS, 'default': 'analyze'}),
+    (('--output', '-o'), 'OUTPUT', '输出目录路径', {}),
+    (('--jobs', '-j'), 'JOBS', 'analyze模式下批量分析多个项目时的并行进程数 (默认: 1)', {'type': int, 'default': 1}),
+)
+
+
+def _format_usage(prog):
+    """生成用法信息"""
+    options = ' '.join(f'[{names[0]} {metavar}]' for names, metavar, _, _ in _OPTIONS)
+    return f'usage: {prog} [-h] {options} project_dir'
+
+
+def _format_help(prog):
+    """生成帮助信息，-h/--help无论是否带其他参数都输出该信息"""
+    lines = [
+        _format_usage(prog),
+        '',
+        _DESCRIPTION,
+        '',
+        'positional arguments:',
+        f'  project_dir           {_PROJECT_DIR_HELP}',
+        '',
+        'options:',
+        '  -h, --help            show this help message and exit',
+    ]
+    for names, metavar, help_text, _ in _OPTIONS:
+        invocation = ', '.join(f'{name} {metavar}' for name in names)
+        if len(invocation) < 22:
+            lines.append(f'  {invocation:<22}{help_text}')
+        else:
+            lines.append(f'  {invocation}')
+            lines.append(f'                        {help_text}')
+        if names[0] == '--mode':
+            lines.extend(f'                          {mode:<18}{desc}' for mode, desc in _MODE_DESCRIPTIONS.items())
+    return '\n'.join(lines)
 
 
 def main():
-    parser = argparse.ArgumentParser(description='CodeDatasetMaker - C/C++项目分析工具')
-    parser.add_argument('project_dir', help='项目目录路径')
-    parser.add_argument('--mode', '-m', choices=['analyze', 'doc', 'f_doc', 'm_doc', 's_doc', 'g_doc', 'startup', 'startup_doc', 'startup_train', 'module_train', 'struct_train', 'function_train', 'global_var_train', 'macro_train'], default='analyze',
-                        help='运行模式: analyze(代码分析)、doc(生成模块文档)、f_doc(生成函数文档)、m_doc(生成宏文档)、s_doc(生成结构体文档)、g_doc(生成全局变量文档)、startup(解析启动文件)、startup_doc(生成启动流程文档)、startup_train(生成启动流程训练样本)、module_train(生成模块训练样本)、struct_train(生成结构体训练样本)、function_train(生成函数训练样本)、global_var_train(生成全局变量训练样本) 或 macro_train(生成宏定义训练样本) (默认: analyze)')
-    parser.add_argument('--output', '-o', help='输出目录路径')
+    prog = os.path.basename(sys.argv[0])
+    argv = sys.argv[1:]
+
+    # 快速处理无参数和单独的-h/--help，无需导入argparse
+    if not argv:
+        print(_format_usage(prog), file=sys.stderr)
+        print(f"{prog}: error: the following arguments are required: project_dir", file=sys.stderr)
+        sys.exit(2)
+    if len(argv) == 1 and argv[0] in ('-h', '--help'):
+        print(_format_help(prog))
+        sys.exit(0)
+
+    # argparse及其依赖只在需要完整解析参数时导入
+    import argparse
+
+    # 用法和帮助信息使用与快速路径相同的文本
+    parser = argparse.ArgumentParser(prog=prog, usage=_format_usage(prog)[len('usage: '):], add_help=False)
+    parser.add_argument('-h', '--help', action='store_true')
+    parser.add_argument('project_dir', nargs='?')
+    for names, metavar, _, kwargs in _OPTIONS:
+        parser.add_argument(*names, metavar=metavar, **kwargs)
     
     # 解析已知参数
-    args, unknown_args = parser.parse_known_args()
+    args, unknown_args = parser.parse_known_args(argv)
+    if args.help:
+        print(_format_help(prog))
+        sys.exit(0)
+    if args.project_dir is None:
+        parser.error("the following arguments are required: project_dir")
+
+    # 未知参数和输出目录一起传递给各功能，未指定输出目录时直接使用未知参数列表
+    forwarded = unknown_args
+    if args.output:
+        forwarded = unknown_args + ['--output', args.output]
     
     # 根据模式调用不同功能
     if args.mode == 'analyze':
-        # 将未知参数传递给启动文件解析功能
-        startup_args = unknown_args[:]
-        if args.output:
-            startup_args.extend(['--output', args.output])
-        parse_startup(args.project_dir, startup_args)
-
-        # 将未知参数传递给分析功能
-        analyze_args = unknown_args[:]
-        if args.output:
-            analyze_args.extend(['--output', args.output])
-        analyze_project(args.project_dir, analyze_args)
-
-        split_args = unknown_args[:]
-        if args.output:
-            split_args.extend(['--output', args.output])
-        split_modules(args.project_dir, split_args)
-    elif args.mode == 'doc':
-        # 将未知参数传递给模块文档生成功能
-        doc_args = unknown_args[:]
-        if args.output:
-            doc_args.extend(['--output', args.output])
-        generate_module_docs(args.project_dir, doc_args)
-    elif args.mode == 'f_doc':
-        # 将未知参数传递给函数文档生成功能
-        f_doc_args = unknown_args[:]
-        if args.output:
-            f_doc_args.extend(['--output', args.output])
-        generate_function_docs(args.project_dir, f_doc_args)
-    elif args.mode == 'm_doc':
-        # 将未知参数传递给宏文档生成功能
-        m_doc_args = unknown_args[:]
-        if args.output:
-            m_doc_args.extend(['--output', args.output])
-        generate_macro_docs(args.project_dir, m_doc_args)
-    elif args.mode == 's_doc':
-        # 将未知参数传递给结构体文档生成功能
-        s_doc_args = unknown_args[:]
-        if args.output:
-            s_doc_args.extend(['--output', args.output])
-        generate_struct_docs(args.project_dir, s_doc_args)
-    elif args.mode == 'g_doc':
-        # 将未知参数传递给全局变量文档生成功能
-        g_doc_args = unknown_args[:]
-        if args.output:
-            g_doc_args.extend(['--output', args.output])
-        generate_global_var_docs(args.project_dir, g_doc_args)
-    elif args.mode == 'startup':
-        # 将未知参数传递给启动文件解析功能
-        startup_args = unknown_args[:]
-        if args.output:
-            startup_args.extend(['--output', args.output])
-        parse_startup(args.project_dir, startup_args)
-    elif args.mode == 'startup_doc':
-        # 将未知参数传递给启动流程文档生成功能
-        startup_doc_args = unknown_args[:]
-        if args.output:
-            startup_doc_args.extend(['--output', args.output])
-        generate_startup_docs(args.project_dir, startup_doc_args)
-    elif args.mode == 'startup_train':
-        # 将未知参数传递给启动流程训练样本生成功能
-        startup_train_args = unknown_args[:]
-        if args.output:
-            startup_train_args.extend(['--output', args.output])
-        generate_startup_train(args.project_dir, startup_train_args)
-    elif args.mode == 'module_train':
-        # 将未知参数传递给模块训练样本生成功能
-        module_train_args = unknown_args[:]
-        if args.output:
-            module_train_args.extend(['--output', args.output])
-        generate_module_train(args.project_dir, module_train_args)
-    elif args.mode == 'struct_train':
-        # 将未知参数传递给结构体训练样本生成功能
-        struct_train_args = unknown_args[:]
-        if args.output:
-            struct_train_args.extend(['--output', args.output])
-        generate_struct_train(args.project_dir, struct_train_args)
-    elif args.mode == 'function_train':
-        # 将未知参数传递给函数训练样本生成功能
-        function_train_args = unknown_args[:]
-        if args.output:
-            function_train_args.extend(['--output', args.output])
-        generate_function_train(args.project_dir, function_train_args)
-    elif args.mode == 'global_var_train':
-        # 将未知参数传递给全局变量训练样本生成功能
-        global_var_train_args = unknown_args[:]
-        if args.output:
-            global_var_train_args.extend(['--output', args.output])
-        generate_global_var_train(args.project_dir, global_var_train_args)
-    elif args.mode == 'macro_train':
-        # 将未知参数传递给宏定义训练样本生成功能
-        macro_train_args = unknown_args[:]
-        if args.output:
-            macro_train_args.extend(['--output', args.output])
-        generate_macro_train(args.project_dir, macro_train_args)
+        # 项目路径不是已存在的目录且包含通配符时，批量分析所有匹配的项目目录
+        # 先按字面路径判断，避免把 proj[1] 这样的真实目录当作通配符
+        if not os.path.isdir(args.project_dir) and glob.has_magic(args.project_dir):
+            project_dirs = sorted(d for d in glob.glob(args.project_dir) if os.path.isdir(d))
+        else:
+            project_dirs = [args.project_dir]
+
+        if len(project_dirs) > 1:
+            # 多个项目的启动文件并发解析
+            parse_startup_batch(project_dirs, forwarded)
+        elif project_dirs:
+            parse_startup(project_dirs[0], forwarded)
+        else:
+            logger.error("没有匹配的项目目录: %s", args.project_dir)
+
+        if args.jobs > 1 and len(project_dirs) > 1:
+            # 代码分析以CPU计算为主，多个项目分别在独立进程中分析
+            # 进程池依赖multiprocessing，只在需要时导入
+            from concurrent.futures import ProcessPoolExecutor
+
+            # 所有项目使用相同的参数，预先绑定
+            analyze = functools.partial(analyze_and_split_in_worker, args=forwarded)
+
+            # 子进程启动时丢弃从父进程继承的缓冲日志，避免重复写入
+            with ProcessPoolExecutor(max_workers=args.jobs, initializer=logger.clear_buffered_handlers) as executor:
+                futures = [
+                    executor.submit(analyze, project_dir)
+                    for project_dir in project_dirs
+                ]
+                for project_dir, future in zip(project_dirs, futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error("项目 %s 代码分析执行出错: %s", project_dir, e)
+        elif len(project_dirs) > 1:
+            # 逐个分析，单个项目失败不影响后续项目
+            for project_dir in project_dirs:
+                try:
+                    analyze_and_split_checked(project_dir, forwarded)
+                except Exception as e:
+                    logger.error("项目 %s 代码分析执行出错: %s", project_dir, e)
+        else:
+            for project_dir in project_dirs:
+                analyze_and_split(project_dir, forwarded)
+    else:
+        _DISPATCH[args.mode](args.project_dir, forwarded)
 
 
 if __name__ == "__main__":